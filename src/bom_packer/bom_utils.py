@@ -7,12 +7,24 @@ from bom_packer.shapes import Part
 def read_bom_csv(filename: str) -> List[Part]:
     parts = []
     base_path = os.path.dirname(os.path.abspath(filename))
-    with open(filename, "r") as csvfile:
-        reader = csv.DictReader(csvfile)
+    with open(filename, "r", newline="") as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, None)
+        if header is None:
+            return parts
+
+        # Resolve column positions once instead of building a dict per row
+        name_idx = header.index("name")
+        path_idx = header.index("file_path")
+        qty_idx = header.index("qty")
+
+        _join = os.path.join
         for row in reader:
+            # DictReader skipped blank lines; keep doing so
+            if not row:
+                continue
             # Convert relative path to absolute path
-            file_path = os.path.join(base_path, row["file_path"])
             parts.append(
-                Part(name=row["name"], file_path=file_path, quantity=int(row["qty"]))
+                Part(row[name_idx], _join(base_path, row[path_idx]), int(row[qty_idx]))
             )
     return parts
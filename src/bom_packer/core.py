@@ -1,5 +1,6 @@
 import logging
 import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Dict, Tuple
 import ezdxf
 from bom_packer.shapes import Part, Placement, Bin
@@ -10,6 +11,17 @@ from bom_packer.bom_utils import read_bom_csv
 
 logger = logging.getLogger(__name__)
 
+ERROR_CATEGORIES = (
+    "file_not_found",
+    "dxf_structure_error",
+    "no_valid_entities",
+    "processing_errors",
+)
+# Human readable headings, built once rather than per summary line
+ERROR_LABELS = {
+    category: category.replace("_", " ").title() for category in ERROR_CATEGORIES
+}
+
 
 def process_bom(
     bom_file: str,
@@ -20,7 +32,7 @@ def process_bom(
     draw_boundaries: bool,
     margin: float,
 ) -> None:
-    logger.info(f"Processing BOM file: {bom_file}")
+    logger.info("Processing BOM file: %s", bom_file)
     nester_config = {
         "bin_width": sheet_width,
         "bin_height": sheet_height,
@@ -45,25 +57,38 @@ def process_parts(
 ) -> Tuple[List[Part], Dict[str, List[str]]]:
     processed_parts: List[Part] = []
     error_summary: Dict[str, List[str]] = {
-        "file_not_found": [],
-        "dxf_structure_error": [],
-        "no_valid_entities": [],
-        "processing_errors": [],
+        category: [] for category in ERROR_CATEGORIES
     }
 
+    # BOMs often list the same DXF on several rows; parse each file once and
+    # share the (read-only) normalized entities between those parts. Files
+    # are read concurrently, results are consumed in BOM order.
+    file_paths = list(dict.fromkeys(part.file_path for part in parts))
+    with get_extraction_executor(len(file_paths)) as executor:
+        extracted: Dict[str, Future] = {
+            file_path: executor.submit(extract_boundary_from_dxf, file_path, margin)
+            for file_path in file_paths
+        }
+
     for part in parts:
         try:
-            width, height, entities, summary = extract_boundary_from_dxf(
-                part.file_path, margin
-            )
+            width, height, entities, summary = extracted[part.file_path].result()
             if width is None or height is None:
                 error_summary["no_valid_entities"].append(
                     f"{part.name} ({part.file_path})"
                 )
                 continue
-            for _ in range(part.quantity):
+            # One entry per BOM row; the nester expands the copies
+            if part.quantity > 0:
                 processed_parts.append(
-                    Part(part.name, part.file_path, 1, width, height, entities)
+                    Part(
+                        part.name,
+                        part.file_path,
+                        part.quantity,
+                        width,
+                        height,
+                        entities,
+                    )
                 )
             if summary["errors"]:
                 error_summary["processing_errors"].extend(
@@ -82,29 +107,58 @@ def process_parts(
     return processed_parts, error_summary
 
 
+def get_extraction_executor(file_count: int):
+    # Parsing is CPU bound and holds the GIL, so several files only parse in
+    # parallel across processes. Spawning and pickling results back costs
+    # more than it saves for a single file or on a single core.
+    workers = min(file_count, os.cpu_count() or 1)
+    if workers > 1:
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=1)
+
+
+def log_error_summary(error_summary: Dict[str, List[str]]):
+    for category, errors in error_summary.items():
+        if not errors:
+            continue
+        logger.error("%s (%d):", ERROR_LABELS.get(category, category), len(errors))
+        for error in errors:
+            logger.error("  %s", error)
+
+
 def nest_parts(parts: List[Part], nester_config: Dict) -> List[Bin]:
     nester = RectNester(nester_config)
     return nester.nest(parts)
 
 
 def log_nesting_results(bins: List[Bin]):
+    # Skip walking every placement and computing bin utilization when the
+    # report would be discarded
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     logger.info("Packing complete. Results:")
     for bin_index, bin in enumerate(bins):
-        logger.info(f"Bin {bin_index}:")
+        logger.info("Bin %d:", bin_index)
         for placement in bin.placements:
-            logger.info(f"  Part {placement.part.name}:")
-            logger.info(f"    Position: ({placement.x}, {placement.y})")
-            logger.info(f"    Rotation: {placement.rotation}")
+            logger.info("  Part %s:", placement.part.name)
+            logger.info("    Position: (%s, %s)", placement.x, placement.y)
+            logger.info("    Rotation: %s", placement.rotation)
 
-    logger.info(f"Total bins used: {get_bin_count(bins)}")
+    logger.info("Total bins used: %d", get_bin_count(bins))
     logger.info(
-        f"Bin utilization: {', '.join(f'{u*100:.2f}%' for u in get_bin_utilization(bins))}"
+        "Bin utilization: %s",
+        ", ".join(f"{u*100:.2f}%" for u in get_bin_utilization(bins)),
     )
 
 
 def write_output_files(bins: List[Bin], output_file: str, draw_boundaries: bool):
     base_name, ext = os.path.splitext(output_file)
+    if ext == ".gz":
+        # Number compressed outputs as name-1.dxf.gz rather than name.dxf-1.gz
+        base_name, inner_ext = os.path.splitext(base_name)
+        ext = inner_ext + ext
     for bin_index, bin in enumerate(bins):
         output_file = f"{base_name}-{bin_index + 1}{ext}"
         write_packed_shapes_to_dxf(bin, output_file, draw_boundaries)
-        logger.info(f"Packed shapes for Bin {bin_index} written to {output_file}")
+        logger.info("Packed shapes for Bin %d written to %s", bin_index, output_file)
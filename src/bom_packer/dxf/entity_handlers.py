@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
 import ezdxf
 from typing import List, Tuple
-import math
+import numpy as np
 
 import logging
 
+from bom_packer.dxf.utils import as_xy_array, transform_point, transform_points
+
 # Configure the logger
 logger = logging.getLogger(__name__)
 
@@ -19,9 +21,17 @@ class EntityHandler(ABC):
         pass
 
     @abstractmethod
-    def copy_and_transform(self, entity, target_layout, placement):
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         pass
 
+    def normalize_many(self, entities, min_x: float, min_y: float, points=None):
+        # Handlers whose coordinates live in plain DXF point attributes
+        # override this to shift all entities of their type in one array op.
+        # `points` optionally holds each entity's get_points() result as an
+        # (N, 2) array (None where unavailable) for handlers that can reuse it.
+        for entity in entities:
+            self.normalize(entity, min_x, min_y)
+
 
 class LineHandler(EntityHandler):
     def get_points(self, entity):
@@ -31,23 +41,45 @@ class LineHandler(EntityHandler):
         entity.dxf.start = (entity.dxf.start[0] - min_x, entity.dxf.start[1] - min_y)
         entity.dxf.end = (entity.dxf.end[0] - min_x, entity.dxf.end[1] - min_y)
 
-    def copy_and_transform(self, entity, target_layout, placement):
+    def normalize_many(self, entities, min_x, min_y, points=None):
+        translate_dxf_points(entities, "start", min_x, min_y)
+        translate_dxf_points(entities, "end", min_x, min_y)
+
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         start = transform_point(entity.dxf.start, placement)
         end = transform_point(entity.dxf.end, placement)
-        return target_layout.add_line(start, end)
+        return target_layout.add_line(start, end, dxfattribs=dxfattribs)
 
 
 class LWPolylineHandler(EntityHandler):
+    # vertices() streams (x, y) pairs straight from the packed vertex array;
+    # get_points() would build full (x, y, start_width, end_width, bulge)
+    # tuples only for everything but x and y to be discarded
     def get_points(self, entity):
-        return entity.get_points()
+        return list(entity.vertices())
 
     def normalize(self, entity, min_x, min_y):
-        points = [(p[0] - min_x, p[1] - min_y) for p in entity.get_points()]
-        entity.set_points(points)
+        points = [(x - min_x, y - min_y) for x, y in entity.vertices()]
+        entity.set_points(points, format="xy")
+
+    def normalize_many(self, entities, min_x, min_y, points=None):
+        # Shift the vertices of every polyline together, then split them back
+        # per entity using the original vertex counts. Vertices already read
+        # while computing the bounds are reused rather than fetched again.
+        if points is None:
+            points = [None] * len(entities)
+        point_arrays = [
+            as_xy_array(entity.vertices()) if pts is None else pts
+            for entity, pts in zip(entities, points)
+        ]
+        offsets = np.cumsum([len(pts) for pts in point_arrays])[:-1]
+        shifted = np.concatenate(point_arrays) - (min_x, min_y)
+        for entity, pts in zip(entities, np.split(shifted, offsets)):
+            entity.set_points(pts.tolist(), format="xy")
 
-    def copy_and_transform(self, entity, target_layout, placement):
-        points = [transform_point(p, placement) for p in entity.get_points()]
-        return target_layout.add_lwpolyline(points)
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
+        points = transform_points(entity.vertices(), placement)
+        return target_layout.add_lwpolyline(points, dxfattribs=dxfattribs)
 
 
 class CircleHandler(EntityHandler):
@@ -62,9 +94,14 @@ class CircleHandler(EntityHandler):
     def normalize(self, entity, min_x, min_y):
         entity.dxf.center = (entity.dxf.center[0] - min_x, entity.dxf.center[1] - min_y)
 
-    def copy_and_transform(self, entity, target_layout, placement):
+    def normalize_many(self, entities, min_x, min_y, points=None):
+        translate_dxf_points(entities, "center", min_x, min_y)
+
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         center = transform_point(entity.dxf.center, placement)
-        return target_layout.add_circle(center, entity.dxf.radius)
+        return target_layout.add_circle(
+            center, entity.dxf.radius, dxfattribs=dxfattribs
+        )
 
 
 class ArcHandler(EntityHandler):
@@ -74,13 +111,17 @@ class ArcHandler(EntityHandler):
     def normalize(self, entity, min_x, min_y):
         entity.dxf.center = (entity.dxf.center[0] - min_x, entity.dxf.center[1] - min_y)
 
-    def copy_and_transform(self, entity, target_layout, placement):
+    def normalize_many(self, entities, min_x, min_y, points=None):
+        translate_dxf_points(entities, "center", min_x, min_y)
+
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         center = transform_point(entity.dxf.center, placement)
         return target_layout.add_arc(
             center,
             entity.dxf.radius,
             entity.dxf.start_angle + placement.rotation,
             entity.dxf.end_angle + placement.rotation,
+            dxfattribs=dxfattribs,
         )
 
 
@@ -94,11 +135,9 @@ class SplineHandler(EntityHandler):
         ]
         entity.set_control_points(control_points)
 
-    def copy_and_transform(self, entity, target_layout, placement):
-        control_points = [
-            transform_point(p, placement) for p in entity.get_control_points()
-        ]
-        return target_layout.add_spline(control_points)
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
+        control_points = transform_points(entity.get_control_points(), placement)
+        return target_layout.add_spline(control_points, dxfattribs=dxfattribs)
 
 
 class EllipseHandler(EntityHandler):
@@ -108,9 +147,14 @@ class EllipseHandler(EntityHandler):
     def normalize(self, entity, min_x, min_y):
         entity.dxf.center = (entity.dxf.center[0] - min_x, entity.dxf.center[1] - min_y)
 
-    def copy_and_transform(self, entity, target_layout, placement):
+    def normalize_many(self, entities, min_x, min_y, points=None):
+        translate_dxf_points(entities, "center", min_x, min_y)
+
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         center = transform_point(entity.dxf.center, placement)
-        return target_layout.add_ellipse(center, entity.dxf.radius)
+        return target_layout.add_ellipse(
+            center, entity.dxf.radius, dxfattribs=dxfattribs
+        )
 
 
 class PointHandler(EntityHandler):
@@ -123,9 +167,12 @@ class PointHandler(EntityHandler):
             entity.dxf.location[1] - min_y,
         )
 
-    def copy_and_transform(self, entity, target_layout, placement):
+    def normalize_many(self, entities, min_x, min_y, points=None):
+        translate_dxf_points(entities, "location", min_x, min_y)
+
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         location = transform_point(entity.dxf.location, placement)
-        return target_layout.add_point(location)
+        return target_layout.add_point(location, dxfattribs=dxfattribs)
 
 
 class SolidHandler(EntityHandler):
@@ -138,9 +185,9 @@ class SolidHandler(EntityHandler):
             (bbox[0] - min_x, bbox[1] - min_y, bbox[2] - min_x, bbox[3] - min_y)
         )
 
-    def copy_and_transform(self, entity, target_layout, placement):
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         bbox = entity.get_bbox()
-        return target_layout.add_solid(bbox)
+        return target_layout.add_solid(bbox, dxfattribs=dxfattribs)
 
 
 class HatchHandler(EntityHandler):
@@ -153,9 +200,9 @@ class HatchHandler(EntityHandler):
             (bbox[0] - min_x, bbox[1] - min_y, bbox[2] - min_x, bbox[3] - min_y)
         )
 
-    def copy_and_transform(self, entity, target_layout, placement):
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         bbox = entity.get_bbox()
-        return target_layout.add_hatch(bbox)
+        return target_layout.add_hatch(bbox, dxfattribs=dxfattribs)
 
 
 class InsertHandler(EntityHandler):
@@ -169,9 +216,12 @@ class InsertHandler(EntityHandler):
     def normalize(self, entity, min_x, min_y):
         entity.dxf.insert = (entity.dxf.insert[0] - min_x, entity.dxf.insert[1] - min_y)
 
-    def copy_and_transform(self, entity, target_layout, placement):
+    def normalize_many(self, entities, min_x, min_y, points=None):
+        translate_dxf_points(entities, "insert", min_x, min_y)
+
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         insertion = transform_point(entity.dxf.insert, placement)
-        return target_layout.add_insert(insertion)
+        return target_layout.add_insert(insertion, dxfattribs=dxfattribs)
 
 
 class TextHandler(EntityHandler):
@@ -182,9 +232,12 @@ class TextHandler(EntityHandler):
     def normalize(self, entity, min_x, min_y):
         entity.dxf.insert = (entity.dxf.insert[0] - min_x, entity.dxf.insert[1] - min_y)
 
-    def copy_and_transform(self, entity, target_layout, placement):
+    def normalize_many(self, entities, min_x, min_y, points=None):
+        translate_dxf_points(entities, "insert", min_x, min_y)
+
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         insertion = transform_point(entity.dxf.insert, placement)
-        return target_layout.add_text(insertion)
+        return target_layout.add_text(insertion, dxfattribs=dxfattribs)
 
 
 class PolylineHandler(EntityHandler):
@@ -198,9 +251,13 @@ class PolylineHandler(EntityHandler):
                 vertex.dxf.location[1] - min_y,
             )
 
-    def copy_and_transform(self, entity, target_layout, placement):
-        points = [transform_point(p, placement) for p in entity.get_points()]
-        return target_layout.add_lwpolyline(points)
+    def normalize_many(self, entities, min_x, min_y, points=None):
+        vertices = [vertex for entity in entities for vertex in entity.vertices]
+        translate_dxf_points(vertices, "location", min_x, min_y)
+
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
+        points = transform_points(entity.get_points(), placement)
+        return target_layout.add_lwpolyline(points, dxfattribs=dxfattribs)
 
 
 class DefaultHandler(EntityHandler):
@@ -210,31 +267,18 @@ class DefaultHandler(EntityHandler):
     def normalize(self, entity, min_x, min_y):
         pass
 
-    def copy_and_transform(self, entity, target_layout, placement):
+    def copy_and_transform(self, entity, target_layout, placement, dxfattribs=None):
         raise ValueError(f"Unsupported entity type: {entity.dxftype()}")
 
 
-def transform_point(point, placement):
-    x, y = safe_vector_access(point, 0), safe_vector_access(point, 1)
-
-    # Apply rotation
-    rotation_rad = math.radians(placement.rotation)
-    x_rot = x * math.cos(rotation_rad) - y * math.sin(rotation_rad)
-    y_rot = x * math.sin(rotation_rad) + y * math.cos(rotation_rad)
-
-    # Apply translation
-    transformed_point = (x_rot + placement.x, y_rot + placement.y)
-    logger.debug(
-        f"Transforming point {point} with placement {placement} to {transformed_point}"
-    )
-    return transformed_point
-
-
-def safe_vector_access(vector, index, default=0.0):
-    try:
-        return float(vector[index])
-    except (IndexError, TypeError):
-        return default
+def translate_dxf_points(entities, attribute, min_x, min_y):
+    if not entities:
+        return
+    # Attribute access (not dxf.get) so points left out of the file resolve to
+    # their DXF default, as they did when the bounds were computed
+    points = as_xy_array(getattr(entity.dxf, attribute) for entity in entities)
+    for entity, (x, y) in zip(entities, (points - (min_x, min_y)).tolist()):
+        entity.dxf.set(attribute, (x, y))
 
 
 # Dictionary mapping entity types to their handlers
@@ -256,5 +300,8 @@ ENTITY_HANDLERS = {
 }
 
 
+DEFAULT_HANDLER = ENTITY_HANDLERS["DEFAULT"]
+
+
 def get_handler(entity_type: str) -> EntityHandler:
-    return ENTITY_HANDLERS.get(entity_type, ENTITY_HANDLERS["DEFAULT"])
+    return ENTITY_HANDLERS.get(entity_type, DEFAULT_HANDLER)
@@ -1,21 +1,26 @@
 import ezdxf
+from ezdxf.addons import iterdxf
+from ezdxf.lldxf.validator import is_binary_dxf_file
+import gzip
 import math
+from collections import defaultdict
 import logging
+import numpy as np
 from typing import List, Tuple, Dict, Any
 from bom_packer.shapes import Part, Placement, Bin
 from bom_packer.dxf.entity_handlers import get_handler
-from bom_packer.dxf.utils import transform_point, safe_vector_access
+from bom_packer.dxf.utils import as_xy_array, transform_points
 
 logger = logging.getLogger(__name__)
 
 
 def extract_boundary_from_dxf(
     filename: str, margin: float = 0.0
-) -> Tuple[float, float, List[ezdxf.entities.DXFEntity], Dict[str, Any]]:
-    doc = ezdxf.readfile(filename)
-    msp = doc.modelspace()
-    all_entities = list(msp)
-    all_points = []
+) -> Tuple[float, float, Tuple[ezdxf.entities.DXFEntity, ...], Dict[str, Any]]:
+    all_entities = read_modelspace_entities(filename)
+    # Only entities that contribute geometry are kept: the rest would be
+    # normalized for nothing and then fail to copy for every placement
+    handled_entities = []
     summary = {
         "supported": {},
         "unsupported": {},
@@ -27,38 +32,75 @@ def extract_boundary_from_dxf(
         entity_type = entity.dxftype()
         handler = get_handler(entity_type)
         try:
-            points = handler.get_points(entity)
-            all_points.extend(points)
-            if points:
-                summary["supported"][entity_type] = (
-                    summary["supported"].get(entity_type, 0) + 1
-                )
-            else:
-                summary["unsupported"][entity_type] = (
-                    summary["unsupported"].get(entity_type, 0) + 1
-                )
+            points = as_xy_array(handler.get_points(entity))
         except Exception as e:
             summary["errors"].append(str(e))
-
-    if not all_points:
-        return None, None, [], summary
+            continue
+        if len(points):
+            handled_entities.append((entity, handler, points))
+            summary["supported"][entity_type] = (
+                summary["supported"].get(entity_type, 0) + 1
+            )
+        else:
+            summary["unsupported"][entity_type] = (
+                summary["unsupported"].get(entity_type, 0) + 1
+            )
+
+    if not handled_entities:
+        return None, None, (), summary
 
     # Calculate the bounding rectangle with margin
-    min_x = min(p[0] for p in all_points) - margin
-    min_y = min(p[1] for p in all_points) - margin
-    max_x = max(p[0] for p in all_points) + margin
-    max_y = max(p[1] for p in all_points) + margin
+    points = np.concatenate([points for _, _, points in handled_entities])
+    min_x, min_y = (points.min(axis=0) - margin).tolist()
+    max_x, max_y = (points.max(axis=0) + margin).tolist()
     width = max_x - min_x
     height = max_y - min_y
 
     # Normalize the entities to the origin, considering the margin
-    normalized_entities = normalize_entities(all_entities, min_x, min_y)
+    normalized_entities = normalize_entities(handled_entities, min_x, min_y)
 
     return width, height, normalized_entities, summary
 
 
-def normalize_entities(entities, min_x, min_y):
-    return [get_handler(e.dxftype()).normalize(e, min_x, min_y) or e for e in entities]
+def read_modelspace_entities(filename: str) -> List[ezdxf.entities.DXFEntity]:
+    # Only modelspace geometry is needed, so stream the ENTITIES section
+    # rather than loading every table, block and object of the document.
+    # The streaming reader only understands ASCII DXF.
+    if is_binary_dxf_file(filename):
+        return list(ezdxf.readfile(filename).modelspace())
+
+    try:
+        doc = iterdxf.opendxf(filename)
+    except ezdxf.DXFStructureError as error:
+        # The streaming reader also rejects files without an ENTITIES (or,
+        # after R12, OBJECTS) section, which readfile loads as an empty
+        # modelspace. Let readfile decide, but keep reporting input that is
+        # not DXF at all as a structure error.
+        try:
+            doc = ezdxf.readfile(filename)
+        except OSError:
+            raise error
+        return list(doc.modelspace())
+
+    try:
+        return list(doc.modelspace())
+    finally:
+        doc.close()
+
+
+def normalize_entities(handled_entities, min_x, min_y):
+    # Takes (entity, handler, points) triples so the handler and points
+    # resolved while computing the bounds are reused instead of fetched again.
+    # Entities are bucketed per handler so each type is shifted in one batch.
+    buckets = {}
+    for entity, handler, points in handled_entities:
+        entities, point_arrays = buckets.setdefault(handler, ([], []))
+        entities.append(entity)
+        point_arrays.append(points)
+    for handler, (entities, point_arrays) in buckets.items():
+        handler.normalize_many(entities, min_x, min_y, point_arrays)
+    # A tuple, since the result is shared by every BOM row and copy of the part
+    return tuple(entity for entity, _, _ in handled_entities)
 
 
 def write_packed_shapes_to_dxf(
@@ -73,12 +115,9 @@ def write_packed_shapes_to_dxf(
     doc.header["$INSUNITS"] = 4
 
     # Group placements by part name
-    placement_groups = {}
+    placement_groups = defaultdict(list)
     for placement in bin.placements:
-        part_name = placement.part.name
-        if part_name not in placement_groups:
-            placement_groups[part_name] = []
-        placement_groups[part_name].append(placement)
+        placement_groups[placement.part.name].append(placement)
 
     # Process each group of placements
     for part_name, group in placement_groups.items():
@@ -88,38 +127,62 @@ def write_packed_shapes_to_dxf(
             layer_name = f"{part_name}_{i}"
             doc.layers.new(name=layer_name)
 
+            dxfattribs = {"layer": layer_name}
             for entity in placement.part.entities:
-                new_entity = copy_and_transform_entity(entity, msp, placement)
-                new_entity.dxf.layer = layer_name
+                copy_and_transform_entity(entity, msp, placement, dxfattribs)
 
             if debug:
                 draw_boundary(msp, placement.part, placement, layer_name)
 
-    doc.saveas(output_file)
-
-
-def copy_and_transform_entity(entity, target_layout, placement):
-    handler = get_handler(entity.dxftype())
+    if output_file.endswith(".gz"):
+        # Compressed output, written with the same encoding and error handler
+        # ezdxf's saveas uses for plain ASCII DXF
+        with gzip.open(
+            output_file,
+            "wt",
+            compresslevel=1,
+            encoding=doc.output_encoding,
+            errors="dxfreplace",
+        ) as fp:
+            doc.write(fp)
+    else:
+        doc.saveas(output_file)
+
+
+def copy_and_transform_entity(entity, target_layout, placement, dxfattribs=None):
+    entity_type = entity.dxftype()
+    handler = get_handler(entity_type)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Transforming %s to (%s, %s) rotated %s",
+            entity_type,
+            placement.x,
+            placement.y,
+            placement.rotation,
+        )
     try:
-        return handler.copy_and_transform(entity, target_layout, placement)
+        return handler.copy_and_transform(entity, target_layout, placement, dxfattribs)
     except ValueError as e:
-        logger.warning(f"Skipping unsupported entity: {str(e)}")
+        logger.warning("Skipping unsupported entity: %s", e)
         return None
 
 
 def draw_boundary(msp, part: Part, placement: Placement, layer_name: str):
+    # Closed outline: the first corner is repeated so the whole polyline goes
+    # through a single batched transform
     points = [
         (0, 0),
         (part.width, 0),
         (part.width, part.height),
         (0, part.height),
+        (0, 0),
     ]
 
-    transformed_points = [transform_point(p, placement) for p in points]
-    logger.debug(f"Drawing boundary with transformed points: {transformed_points}")
+    transformed_points = transform_points(points, placement)
+    logger.debug("Drawing boundary with transformed points: %s", transformed_points)
 
     msp.add_lwpolyline(
-        transformed_points + [transformed_points[0]],
+        transformed_points,
         dxfattribs={
             "layer": f"DEBUG_{layer_name}",
             "color": 1,  # 1 is the AutoCAD color code for red
@@ -1,6 +1,6 @@
 import ezdxf
-import math
 import logging
+import numpy as np
 
 # Configure the logger
 logger = logging.getLogger(__name__)
@@ -14,16 +14,40 @@ def safe_vector_access(vector, index, default=0.0):
 
 
 def transform_point(point, placement):
-    x, y = safe_vector_access(point, 0), safe_vector_access(point, 1)
+    # ezdxf vectors and coordinate tuples index directly; only fall back to
+    # the defensive accessor for malformed input
+    try:
+        x, y = point[0], point[1]
+    except (IndexError, TypeError):
+        x, y = safe_vector_access(point, 0), safe_vector_access(point, 1)
 
     # Apply rotation
-    rotation_rad = math.radians(placement.rotation)
-    x_rot = x * math.cos(rotation_rad) - y * math.sin(rotation_rad)
-    y_rot = x * math.sin(rotation_rad) + y * math.cos(rotation_rad)
+    cos_rot, sin_rot = placement.cos_rot, placement.sin_rot
+    x_rot = x * cos_rot - y * sin_rot
+    y_rot = x * sin_rot + y * cos_rot
 
     # Apply translation
-    transformed_point = (x_rot + placement.x, y_rot + placement.y)
-    logger.debug(
-        f"Transforming point {point} with placement {placement} to {transformed_point}"
-    )
-    return transformed_point
+    return (x_rot + placement.x, y_rot + placement.y)
+
+
+def as_xy_array(points):
+    # Pack points into a contiguous (N, 2) float64 array of their x/y
+    # components. Handlers may mix point kinds (TEXT and INSERT return a Vec3
+    # next to a 2-tuple), so take x/y per point rather than letting NumPy
+    # infer a shape from the whole sequence.
+    coords = np.fromiter((c for p in points for c in (p[0], p[1])), dtype=np.float64)
+    return coords.reshape(-1, 2)
+
+
+def transform_points(points, placement):
+    # Batched variant of transform_point for multi-vertex entities: one
+    # rotation matrix per call instead of per-point trig and Python math
+    pts = as_xy_array(points)
+    if not len(pts):
+        return []
+
+    cos_rot, sin_rot = placement.cos_rot, placement.sin_rot
+    rotation = np.array([[cos_rot, -sin_rot], [sin_rot, cos_rot]])
+
+    transformed = pts @ rotation.T + np.array([placement.x, placement.y])
+    return transformed.tolist()
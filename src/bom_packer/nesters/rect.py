@@ -1,9 +1,11 @@
 from typing import List
 import logging
 
-from rectpack import newPacker, PackingMode, PackingBin, SORT_AREA
+import numpy as np
+from rectpack import newPacker, PackingMode, PackingBin, SORT_AREA, SORT_NONE
 
 from bom_packer.shapes import Part, Placement, Bin
+from bom_packer.nesters.utils import get_copy_parts, get_sort_order
 
 logger = logging.getLogger(__name__)
 
@@ -14,48 +16,100 @@ class RectNester:
         self.config = {
             "allow_rotate": config.get("allow_rotate", True),
             "sort_algo": config.get("sort_algo", SORT_AREA),
+            # Parts are already in packing order; skip sorting entirely
+            "presorted": config.get("presorted", False),
         }
 
     def nest(self, parts: List[Part]) -> List[Bin]:
+        # Parts carry a quantity; every copy is packed as its own rectangle,
+        # identified by its position in copy_parts
+        copy_parts = get_copy_parts(parts)
+        copy_count = len(copy_parts)
+
+        sort_algo = self.config["sort_algo"]
+        order = range(copy_count)
+        if self.config["presorted"]:
+            sort_algo = SORT_NONE
+        else:
+            # Sort once in NumPy instead of through rectpack's per-item key
+            # lambda when the configured algorithm has a vectorized equivalent
+            sort_order = get_sort_order(parts, sort_algo)
+            if sort_order is not None:
+                order = sort_order
+                sort_algo = SORT_NONE
+
         packer = newPacker(
             mode=PackingMode.Offline,
-            sort_algo=self.config["sort_algo"],
+            sort_algo=sort_algo,
             rotation=self.config["allow_rotate"],
         )
 
         # Add initial bin
         packer.add_bin(*self.default_bin_size, count=float("inf"))
 
-        # Add rectangles to the packer
-        for i, part in enumerate(parts):
-            packer.add_rect(part.width, part.height, rid=i)
+        # Add rectangles to the packer, skipping parts that cannot fit an
+        # empty sheet in any allowed orientation; rectpack would otherwise try
+        # them against every open bin before dropping them
+        bin_width, bin_height = self.default_bin_size
+        allow_rotate = self.config["allow_rotate"]
+        fits = [
+            (part.width <= bin_width and part.height <= bin_height)
+            or (allow_rotate and part.height <= bin_width and part.width <= bin_height)
+            for part in parts
+        ]
+        for i in order:
+            part_index = copy_parts[i]
+            if fits[part_index]:
+                part = parts[part_index]
+                packer.add_rect(part.width, part.height, rid=i)
+
+        oversized = [part for part, part_fits in zip(parts, fits) if not part_fits]
+        if oversized:
+            logger.warning(
+                "Skipping %d parts larger than the %sx%s sheet: %s",
+                sum(part.quantity for part in oversized),
+                bin_width,
+                bin_height,
+                ", ".join(part.name for part in oversized),
+            )
 
         # Start packing
         packer.pack()
 
         bins = []
+        packed_count = 0
+        packed = np.zeros(copy_count, dtype=bool)
         for abin in packer:
             if not abin:
                 continue
             new_bin = Bin(*self.default_bin_size)
+            placements = new_bin.placements
             for rect in abin:
-                original_part = parts[rect.rid]
-                placement = Placement(
-                    rect.x,
-                    rect.y,
-                    90 if rect.width != original_part.width else 0,
-                    original_part,
-                )
-                new_bin.placements.append(placement)
+                original_part = parts[copy_parts[rect.rid]]
+                packed[rect.rid] = True
+                rotation = 90 if rect.width != original_part.width else 0
+                placements.append(Placement(rect.x, rect.y, rotation, original_part))
+            packed_count += len(placements)
             bins.append(new_bin)
 
-        if len(parts) != sum(len(bin.placements) for bin in bins):
+        # Counting the unpacked copies per part is only worth doing when the
+        # warnings are emitted
+        if copy_count != packed_count and logger.isEnabledFor(logging.WARNING):
             logger.warning(
-                f"Not all parts were packed. Packed {sum(len(bin.placements) for bin in bins)} out of {len(parts)} parts."
+                "Not all parts were packed. Packed %d out of %d parts.",
+                packed_count,
+                copy_count,
+            )
+            # One entry per part with its number of unpacked copies
+            unpacked_counts = np.bincount(
+                np.asarray(copy_parts)[~packed], minlength=len(parts)
             )
-            unpacked_parts = set(range(len(parts))) - set(
-                p.part.name for bin in bins for p in bin.placements
+            logger.warning(
+                "Unpacked parts: %s",
+                ", ".join(
+                    f"{parts[i].name} x{unpacked_counts[i]}"
+                    for i in np.flatnonzero(unpacked_counts)
+                ),
             )
-            logger.warning(f"Unpacked parts: {unpacked_parts}")
 
         return bins
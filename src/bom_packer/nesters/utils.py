@@ -1,5 +1,7 @@
-from typing import List
-from bom_packer.shapes import Bin
+from typing import List, Optional
+import numpy as np
+from rectpack import SORT_AREA, SORT_PERI, SORT_DIFF, SORT_SSIDE, SORT_LSIDE, SORT_RATIO
+from bom_packer.shapes import Bin, Part
 
 
 def get_bin_count(bins: List[Bin]) -> int:
@@ -7,8 +9,57 @@ def get_bin_count(bins: List[Bin]) -> int:
 
 
 def get_bin_utilization(bins: List[Bin]) -> List[float]:
-    return [calculate_used_area(bin) / (bin.width * bin.height) for bin in bins]
+    # Sum every placement's area into its bin with one weighted bincount
+    # rather than a Python-level sum per bin
+    bin_ids = np.repeat(np.arange(len(bins)), [len(bin.placements) for bin in bins])
+    areas = np.fromiter(
+        (p.part.width * p.part.height for bin in bins for p in bin.placements),
+        np.float64,
+        len(bin_ids),
+    )
+    used = np.bincount(bin_ids, weights=areas, minlength=len(bins))
+    capacity = np.array([bin.width * bin.height for bin in bins], dtype=np.float64)
+    return (used / capacity).tolist()
 
 
 def calculate_used_area(bin: Bin) -> float:
     return sum(p.part.width * p.part.height for p in bin.placements)
+
+
+def get_copy_parts(parts: List[Part]) -> List[int]:
+    # Index of the part behind each physical copy, copies of a part adjacent
+    # and parts in input order
+    return np.repeat(np.arange(len(parts)), [p.quantity for p in parts]).tolist()
+
+
+# NumPy equivalents of rectpack's sort algorithms, as sort keys from most to
+# least significant. rectpack sorts descending with a stable sort, so ties
+# keep their input order.
+_SORT_KEYS = {
+    SORT_AREA: lambda w, h: (w * h,),
+    SORT_PERI: lambda w, h: (w + h,),
+    SORT_DIFF: lambda w, h: (np.abs(w - h),),
+    SORT_SSIDE: lambda w, h: (np.minimum(w, h), np.maximum(w, h)),
+    SORT_LSIDE: lambda w, h: (np.maximum(w, h), np.minimum(w, h)),
+    SORT_RATIO: lambda w, h: (w / h,),
+}
+
+
+def get_sort_order(parts: List[Part], sort_algo) -> Optional[List[int]]:
+    # Order in which rectpack's `sort_algo` would pack every copy of `parts`,
+    # as indices into the copies laid out part by part (see get_copy_parts),
+    # computed in one vectorized pass; None when the algorithm has no NumPy
+    # equivalent
+    key_fn = _SORT_KEYS.get(sort_algo)
+    if key_fn is None:
+        return None
+    quantities = [p.quantity for p in parts]
+    widths = np.repeat(
+        np.fromiter((p.width for p in parts), np.float64, len(parts)), quantities
+    )
+    heights = np.repeat(
+        np.fromiter((p.height for p in parts), np.float64, len(parts)), quantities
+    )
+    # np.lexsort is stable and treats its last key as the primary one
+    keys = [-key for key in reversed(key_fn(widths, heights))]
+    return np.lexsort(keys).tolist()
@@ -1,4 +1,5 @@
-from typing import List, NamedTuple, Optional
+from typing import List, NamedTuple, Optional, Tuple
+import math
 import ezdxf
 
 
@@ -8,18 +9,26 @@ class Part(NamedTuple):
     quantity: int
     width: Optional[float] = None
     height: Optional[float] = None
-    entities: Optional[List[ezdxf.entities.DXFEntity]] = None
+    entities: Optional[Tuple[ezdxf.entities.DXFEntity, ...]] = None
 
 
 class Placement:
+    __slots__ = ("x", "y", "rotation", "part", "cos_rot", "sin_rot")
+
     def __init__(self, x: float, y: float, rotation: float, part: Part):
         self.x = x
         self.y = y
         self.rotation = rotation
         self.part = part
+        # Rotation terms shared by every point transformed for this placement
+        rotation_rad = math.radians(rotation)
+        self.cos_rot = math.cos(rotation_rad)
+        self.sin_rot = math.sin(rotation_rad)
 
 
 class Bin:
+    __slots__ = ("width", "height", "placements")
+
     def __init__(self, width: float, height: float):
         self.width = width
         self.height = height